@@ -70,7 +70,8 @@ defmodule SnakepitDspy do
 
   - `api_key` - Gemini API key (defaults to GEMINI_API_KEY env var)
   - `model` - Gemini model name (defaults to gemini-2.5-flash-lite-preview-06-17)
-  - `opts` - Additional options (temperature, etc.)
+  - `opts` - Additional options (temperature, verify, etc.). Pass `verify: true`
+    to make a test call to the model before configuring it.
 
   ## Examples
 
@@ -89,7 +90,8 @@ defmodule SnakepitDspy do
       model: model,
       api_key: actual_api_key,
       provider: "google",
-      temperature: Keyword.get(opts, :temperature, 0.7)
+      temperature: Keyword.get(opts, :temperature, 0.7),
+      verify: Keyword.get(opts, :verify, false)
     }
 
     execute("configure_lm", config)
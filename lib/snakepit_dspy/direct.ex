@@ -155,6 +155,7 @@ defmodule SnakepitDspy.Direct do
     - `model` - Model name (e.g., "gemini-2.5-flash-lite-preview-06-17")
     - `api_key` - API key for the model provider
     - `provider` - Provider name (e.g., "google")
+    - `verify` - Make a test call to the model before configuring (default: false)
   - `timeout` - Operation timeout (optional)
   """
   def configure_lm(worker, config, timeout \\ @default_timeout) do
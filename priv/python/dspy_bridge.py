@@ -4,6 +4,9 @@
 import sys
 import os
 
+# Verbose diagnostics on stderr, off unless DSPY_BRIDGE_DEBUG=1
+DEBUG = os.getenv("DSPY_BRIDGE_DEBUG") == "1"
+
 # DEBUG LOGGING DISABLED - define no-op function to prevent 172GB log files
 def debug_log(message):
     """No-op debug logging to prevent massive log file spam"""
@@ -13,7 +16,8 @@ def debug_log(message):
 DSPy Bridge for Snakepit Integration
 
 This module provides a communication bridge between Snakepit and Python DSPy
-processes using a JSON-based protocol with length-prefixed messages.
+processes using a length-prefixed message protocol. Payloads are JSON by
+default; MessagePack can be negotiated per connection via the ping command.
 
 Features:
 - Dynamic DSPy signature creation from Elixir definitions
@@ -24,9 +28,22 @@ Features:
 
 Protocol:
 - 4-byte big-endian length header
-- JSON message payload
+- JSON message payload (or MessagePack once negotiated)
 - Request/response correlation with IDs
 
+Codec negotiation:
+    Send ``ping`` with ``{"codec": "msgpack"}``. The ping response is still
+    encoded with the current codec and reports the codec that will be used
+    for all subsequent messages in its ``codec`` field. If msgpack is not
+    installed the bridge stays on JSON.
+
+JSON codec:
+    orjson is used when installed, otherwise the stdlib json module.
+    Responses orjson cannot encode (ints wider than 64 bits, non-str keys)
+    fall back to the stdlib encoder. Two differences remain with orjson:
+    NaN and infinity are encoded as ``null``, and some orjson versions
+    decode integers wider than 64 bits in requests as floats.
+
 Usage:
     python3 dspy_bridge.py --mode pool-worker
 
@@ -35,7 +52,6 @@ The script reads from stdin and writes to stdout using the packet protocol.
 
 import sys
 import json
-import struct
 import traceback
 import time
 import gc
@@ -44,7 +60,10 @@ import os
 import argparse
 import re
 import signal
+import select
 import atexit
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Union
 
 # Handle DSPy import with fallback
@@ -66,6 +85,59 @@ except ImportError as e:
                 return {"status": "error", "error": "DSPy not available"}
     dspy = MockDSPy()
 
+# Handle MessagePack import with fallback
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+    print("MessagePack imported successfully", file=sys.stderr)
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    print("MessagePack not available, using JSON only", file=sys.stderr)
+
+# Handle orjson import with fallback to the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Handle msgspec import with fallback; with it, msgpack requests decode
+# straight into a typed struct instead of an intermediate dict
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+    
+    class Request(msgspec.Struct):
+        """Request envelope decoded directly from the wire."""
+        id: Union[str, int, None] = None
+        command: str = ""
+        args: Dict[str, Any] = {}
+    
+    _MSGPACK_DECODER = msgspec.msgpack.Decoder(Request)
+    _MSGPACK_ENCODER = msgspec.msgpack.Encoder()
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+    
+    class Request:
+        """Request envelope built from a decoded dict."""
+        
+        __slots__ = ("id", "command", "args")
+        
+        def __init__(self, id, command, args):
+            self.id = id
+            self.command = command
+            self.args = args
+
+def _request_from_dict(data: Dict[str, Any]) -> Request:
+    """Build a Request from a decoded JSON or msgpack dict.
+    
+    Missing args default to {}; an explicit null is kept as-is, matching the
+    typed msgspec decode.
+    """
+    return Request(data.get("id"), data.get("command"), data.get("args", {}))
+
+SUPPORTED_CODECS = ["json", "msgpack"] if MSGPACK_AVAILABLE or MSGSPEC_AVAILABLE else ["json"]
+
 # Handle Gemini API import with fallback
 try:
     import google.generativeai as genai
@@ -103,11 +175,46 @@ def configure_gemini_api():
 # Configure Gemini on import
 GEMINI_CONFIGURED = configure_gemini_api()
 
+# Invariant part of the ping response, copied and completed per ping
+_PING_STATIC = {
+    "status": "ok",
+    "bridge_type": "dspy",
+    "dspy_available": DSPY_AVAILABLE,
+    "gemini_available": GEMINI_CONFIGURED,
+    "mode": "pool-worker",
+    "python_version": sys.version,
+    "supported_codecs": SUPPORTED_CODECS
+}
+
+def _output_names(signature_def: Dict[str, Any]) -> tuple:
+    """Precompute the output field names of a signature for fast extraction."""
+    return tuple(field["name"] for field in signature_def.get("outputs", []))
+
+def _err(message: str, exc: Exception) -> Dict[str, Any]:
+    """Build an error response; the formatted traceback is only added in DEBUG mode."""
+    response = {"status": "error", "error": f"{message}: {str(exc)}"}
+    if DEBUG:
+        response["_traceback"] = traceback.format_exc()
+    return response
+
+# Sentinel for "field not present on the prediction"
+_MISSING = object()
+
+# Ordered accessors for reading an output field off a DSPy prediction
+_EXTRACTORS = (
+    lambda result, name: getattr(result, name, _MISSING),
+    lambda result, name: result._store.get(name, _MISSING) if getattr(result, "_store", None) else _MISSING,
+)
+
 class DSPySignatureBuilder:
     """Builds DSPy signatures from Elixir field definitions."""
     
+    __slots__ = ("signatures", "_sig_cache")
+    
     def __init__(self):
         self.signatures = {}
+        # Signature classes keyed by signature string
+        self._sig_cache = {}
     
     def build_signature(self, signature_def: Dict[str, Any]) -> tuple:
         """Build a DSPy signature from field definitions.
@@ -121,41 +228,51 @@ class DSPySignatureBuilder:
         inputs = signature_def.get('inputs', [])
         outputs = signature_def.get('outputs', [])
         
-        # Build field mapping for input/output translation
+        # Collect field names and the input/output field mapping in one pass
+        input_names = []
+        output_names = []
         field_mapping = {}
+        for field in inputs:
+            name = field['name']
+            input_names.append(name)
+            field_mapping[name] = name
+        for field in outputs:
+            name = field['name']
+            output_names.append(name)
+            field_mapping[name] = name
         
         # Build the signature string using DSPy's expected format
-        # DSPy signatures use a simple format: "input1, input2 -> output1, output2"
+        # DSPy signatures use a simple format: "input1,input2->output1,output2"
+        signature_string = f"{','.join(input_names)}->{','.join(output_names)}"
         
-        input_names = [field['name'] for field in inputs]
-        output_names = [field['name'] for field in outputs]
+        # Reuse the signature class if this signature was built before
+        signature_class = self._sig_cache.get(signature_string)
+        if signature_class is not None:
+            return signature_class, field_mapping
         
-        signature_string = f"{', '.join(input_names)} -> {', '.join(output_names)}"
-        
-        print(f"DEBUG: Building signature string: {signature_string}", file=sys.stderr)
-        
-        # Build field mapping
-        for field in inputs + outputs:
-            name = field['name']
-            field_mapping[name] = name
-        
-        # Create the signature class using proper DSPy syntax
-        import dspy
+        if DEBUG:
+            print(f"DEBUG: Building signature string: {signature_string}", file=sys.stderr)
         
         # Create signature using the string format that DSPy expects
         signature_class = dspy.Signature(signature_string)
+        self._sig_cache[signature_string] = signature_class
         
-        print(f"DEBUG: Created signature class: {signature_class}", file=sys.stderr)
-        print(f"DEBUG: Signature class type: {type(signature_class)}", file=sys.stderr)
+        if DEBUG:
+            print(f"DEBUG: Created signature class: {signature_class}", file=sys.stderr)
+            print(f"DEBUG: Signature class type: {type(signature_class)}", file=sys.stderr)
         
         return signature_class, field_mapping
 
 class DSPyProgramManager:
     """Manages DSPy programs and their execution."""
     
+    __slots__ = ("programs", "signature_builder", "_count_lock")
+    
     def __init__(self):
         self.programs = {}
         self.signature_builder = DSPySignatureBuilder()
+        # execute_program runs on the handler's thread pool
+        self._count_lock = threading.Lock()
         
     def create_program(self, program_id: str, signature_def: Dict[str, Any], 
                       instructions: str = None, program_type: str = "predict") -> Dict[str, Any]:
@@ -188,7 +305,8 @@ class DSPyProgramManager:
                 "instructions": instructions,
                 "program_type": program_type,
                 "created_at": time.time(),
-                "execution_count": 0
+                "execution_count": 0,
+                "_output_list": _output_names(signature_def)
             }
             
             return {
@@ -220,24 +338,23 @@ class DSPyProgramManager:
             try:
                 result = program(**inputs)
                 
-                # Update execution count
-                program_info["execution_count"] += 1
+                # Update execution count; capture it for this request's response
+                with self._count_lock:
+                    program_info["execution_count"] += 1
+                    execution_count = program_info["execution_count"]
                 
                 # Extract outputs based on signature
                 outputs = {}
-                signature_def = program_info["signature_def"]
                 
-                for output_field in signature_def.get("outputs", []):
-                    field_name = output_field["name"]
+                for field_name in program_info["_output_list"]:
                     if hasattr(result, field_name):
                         outputs[field_name] = getattr(result, field_name)
                 
                 return {
                     "status": "ok",
                     "program_id": program_id,
-                    "inputs": inputs,
                     "outputs": outputs,
-                    "execution_count": program_info["execution_count"]
+                    "execution_count": execution_count
                 }
                 
             except Exception as e:
@@ -316,29 +433,50 @@ class DSPyProgramManager:
 class DSPyBridge:
     """Main bridge class handling communication with Snakepit."""
     
+    __slots__ = ("start_time", "request_count", "program_manager", "_recreate_cache", "_handlers", "_now")
+    
     def __init__(self):
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
+        # Wall-clock time of the request being processed, set by ProtocolHandler
+        self._now = time.time()
         self.request_count = 0
         self.program_manager = DSPyProgramManager()
+        self._recreate_cache = functools.lru_cache(maxsize=128)(self._build_predict)
+        self._handlers = {
+            "ping": self.handle_ping,
+            "configure_lm": self.handle_configure_lm,
+            "create_program": self.handle_create_program,
+            "execute_program": self.handle_execute_program,
+            "get_program": self.handle_get_program,
+            "list_programs": self.handle_list_programs,
+            "delete_program": self.handle_delete_program,
+            "clear_session": self.handle_clear_session
+        }
         
     def handle_ping(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle ping command."""
+        """Handle ping command.
+        
+        An optional ``codec`` argument requests a wire codec for the rest of
+        the connection; unsupported codecs fall back to JSON.
+        """
         self.request_count += 1
         
-        return {
-            "status": "ok",
-            "bridge_type": "dspy",
-            "dspy_available": DSPY_AVAILABLE,
-            "gemini_available": GEMINI_CONFIGURED,
-            "uptime": time.time() - self.start_time,
-            "mode": "pool-worker",
-            "timestamp": time.time(),
-            "python_version": sys.version,
-            "worker_id": args.get("worker_id", "unknown")
-        }
+        response = _PING_STATIC.copy()
+        response["uptime"] = time.monotonic() - self.start_time
+        response["timestamp"] = self._now
+        response["worker_id"] = args.get("worker_id", "unknown")
+        
+        codec = args.get("codec")
+        if codec is not None:
+            response["codec"] = codec if codec in SUPPORTED_CODECS else "json"
+        
+        return response
     
     def handle_configure_lm(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle configure_lm command to set up language model."""
+        """Handle configure_lm command to set up language model.
+        
+        Pass ``verify: true`` to make a test call to the LM before configuring.
+        """
         global current_lm, lm_type, lm_config
         
         try:
@@ -357,20 +495,22 @@ class DSPyBridge:
             # Configure DSPy language model
             if provider == "google" and model.startswith("gemini"):
                 # Use LiteLLM for Gemini via DSPy
-                import dspy
-                
                 # Debug: Print configuration details
-                print(f"DEBUG: Configuring DSPy with model: gemini/{model}", file=sys.stderr)
-                print(f"DEBUG: API key length: {len(api_key) if api_key else 0}", file=sys.stderr)
+                if DEBUG:
+                    print(f"DEBUG: Configuring DSPy with model: gemini/{model}", file=sys.stderr)
+                    print(f"DEBUG: API key length: {len(api_key) if api_key else 0}", file=sys.stderr)
                 
                 try:
                     # Create LM instance
                     lm = dspy.LM(f"gemini/{model}", api_key=api_key)
                     
-                    # Test the LM with a simple call
-                    print(f"DEBUG: Testing LM with simple call", file=sys.stderr)
-                    test_response = lm("Hello, this is a test.")
-                    print(f"DEBUG: Test response: {test_response}", file=sys.stderr)
+                    # Optionally test the LM with a simple call
+                    if args.get("verify", False):
+                        if DEBUG:
+                            print(f"DEBUG: Testing LM with simple call", file=sys.stderr)
+                        test_response = lm("Hello, this is a test.")
+                        if DEBUG:
+                            print(f"DEBUG: Test response: {test_response}", file=sys.stderr)
                     
                     # Configure DSPy to use this LM
                     dspy.configure(lm=lm)
@@ -379,7 +519,8 @@ class DSPyBridge:
                     lm_type = "gemini"
                     lm_config = {"model": model, "api_key": api_key[:8] + "...", "provider": provider}
                     
-                    print(f"DEBUG: DSPy configured successfully", file=sys.stderr)
+                    if DEBUG:
+                        print(f"DEBUG: DSPy configured successfully", file=sys.stderr)
                     
                     return {
                         "status": "ok", 
@@ -389,10 +530,7 @@ class DSPyBridge:
                     }
                     
                 except Exception as e:
-                    print(f"DEBUG: LM configuration failed: {str(e)}", file=sys.stderr)
-                    import traceback
-                    print(f"DEBUG: Traceback: {traceback.format_exc()}", file=sys.stderr)
-                    return {"status": "error", "error": f"LM configuration failed: {str(e)}"}
+                    return _err("LM configuration failed", e)
             else:
                 return {"status": "error", "error": f"Unsupported provider/model: {provider}/{model}"}
                 
@@ -443,9 +581,23 @@ class DSPyBridge:
                 return self.program_manager.execute_program(program_id, inputs)
             
         except Exception as e:
-            import traceback
-            error_details = f"Execute program failed: {str(e)}\nTraceback: {traceback.format_exc()}"
-            return {"status": "error", "error": error_details}
+            return _err("Execute program failed", e)
+    
+    def handle_get_program(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle get_program command."""
+        return self.program_manager.get_program(args.get("program_id"))
+    
+    def handle_list_programs(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle list_programs command."""
+        return self.program_manager.list_programs()
+    
+    def handle_delete_program(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle delete_program command."""
+        return self.program_manager.delete_program(args.get("program_id"))
+    
+    def handle_clear_session(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle clear_session command."""
+        return self.program_manager.clear_session()
     
     def _recreate_program_from_data(self, program_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -463,15 +615,12 @@ class DSPyBridge:
         try:
             signature_def = program_data.get('signature_def', {})
             
-            # Recreate the signature and program
-            signature_class, field_mapping = self.program_manager.signature_builder.build_signature(signature_def)
-            
             if not current_lm:
                 raise RuntimeError("No LM is loaded.")
             
-            # Create the program
-            import dspy
-            program = dspy.Predict(signature_class)
+            # Reuse the signature and program built for an identical signature
+            sig_key = json.dumps(signature_def, sort_keys=True, separators=(',', ':'))
+            program, signature_class, field_mapping, extract_plan = self._recreate_cache(sig_key)
             
             return {
                 'program': program,
@@ -481,13 +630,31 @@ class DSPyBridge:
                 'program_id': program_data.get('program_id'),
                 'created_at': program_data.get('created_at'),
                 'execution_count': program_data.get('execution_count', 0),
-                'last_executed': program_data.get('last_executed')
+                'last_executed': program_data.get('last_executed'),
+                '_extract_plan': extract_plan,
+                '_output_list': _output_names(signature_def)
             }
             
         except Exception as e:
-            import traceback
-            error_details = f"Failed to recreate program: {str(e)}\nTraceback: {traceback.format_exc()}"
-            raise RuntimeError(error_details)
+            # The caller's error response carries the chained traceback in DEBUG mode
+            raise RuntimeError(f"Failed to recreate program: {str(e)}") from e
+    
+    def _build_predict(self, sig_key: str) -> tuple:
+        """Build the signature and Predict program for a canonical signature JSON.
+        
+        Wrapped in an LRU cache per bridge, so repeated cross-worker executions
+        of the same signature share one program object.
+        """
+        signature_def = json.loads(sig_key)
+        signature_class, field_mapping = self.program_manager.signature_builder.build_signature(signature_def)
+        
+        # Create the program
+        program = dspy.Predict(signature_class)
+        
+        # Shared extraction plan, filled in by _extract_outputs
+        extract_plan = {"mode": None}
+        
+        return program, signature_class, field_mapping, extract_plan
     
     def _execute_with_program_info(self, program_info: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a program using recreated program info."""
@@ -502,86 +669,26 @@ class DSPyBridge:
                 dspy_inputs[dspy_field] = value
             
             # Execute the program
-            debug_log(f"Executing program with inputs: {dspy_inputs}")
-            debug_log(f"Current LM status: {current_lm is not None}")
-            if current_lm:
-                debug_log(f"Current LM type: {type(current_lm)}")
+            if DEBUG:
+                debug_log(f"Executing program with inputs: {dspy_inputs}")
+                debug_log(f"Current LM status: {current_lm is not None}")
+                if current_lm:
+                    debug_log(f"Current LM type: {type(current_lm)}")
             
             result = program(**dspy_inputs)
-            debug_log(f"Program execution result type: {type(result)}")
-            debug_log(f"Result attributes: {[attr for attr in dir(result) if not attr.startswith('_')]}")
-            debug_log(f"Result __dict__: {result.__dict__ if hasattr(result, '__dict__') else 'No __dict__'}")
             
             # Check what's actually available on the result object
-            print(f"DEBUG: Result type: {type(result)}", file=sys.stderr)
-            print(f"DEBUG: Result dir: {[attr for attr in dir(result) if not attr.startswith('_')]}", file=sys.stderr)
-            if hasattr(result, '__dict__'):
-                print(f"DEBUG: Result dict: {result.__dict__}", file=sys.stderr)
+            if DEBUG:
+                debug_log(f"Program execution result type: {type(result)}")
+                debug_log(f"Result attributes: {[attr for attr in dir(result) if not attr.startswith('_')]}")
+                debug_log(f"Result __dict__: {result.__dict__ if hasattr(result, '__dict__') else 'No __dict__'}")
+                print(f"DEBUG: Result type: {type(result)}", file=sys.stderr)
+                print(f"DEBUG: Result dir: {[attr for attr in dir(result) if not attr.startswith('_')]}", file=sys.stderr)
+                if hasattr(result, '__dict__'):
+                    print(f"DEBUG: Result dict: {result.__dict__}", file=sys.stderr)
             
             # Extract only the expected output fields from the signature
-            signature_def = program_info.get('signature_def', {})
-            expected_outputs = signature_def.get('outputs', [])
-            
-            outputs = {}
-            
-            # First try to extract using field mapping
-            field_mapping = program_info.get('field_mapping', {})
-            if field_mapping:
-                for original_name, sanitized_name in field_mapping.items():
-                    # Only extract output fields
-                    if any(field['name'] == original_name for field in expected_outputs):
-                        if hasattr(result, sanitized_name):
-                            outputs[original_name] = str(getattr(result, sanitized_name))
-                        else:
-                            outputs[original_name] = f"Field '{sanitized_name}' not found in prediction."
-            
-            # If no field mapping or outputs still empty, try direct field names
-            if not outputs:
-                for output_field in expected_outputs:
-                    field_name = output_field['name']
-                    
-                    if hasattr(result, field_name):
-                        outputs[field_name] = str(getattr(result, field_name))
-                    else:
-                        outputs[field_name] = f"Field '{field_name}' not found in prediction."
-            
-            # If still no outputs, try DSPy-specific extraction methods
-            if not outputs or all("[" in str(v) and "]" in str(v) for v in outputs.values()):
-                print("DEBUG: Using DSPy-specific extraction", file=sys.stderr)
-                
-                # Try to access the result using DSPy's internal structure
-                if hasattr(result, '_store') and result._store:
-                    print(f"DEBUG: Found _store: {result._store}", file=sys.stderr)
-                    for expected_field in [field['name'] for field in expected_outputs]:
-                        if expected_field in result._store:
-                            outputs[expected_field] = str(result._store[expected_field])
-                
-                # Try accessing completions directly
-                if hasattr(result, '_completions') and result._completions:
-                    print(f"DEBUG: Found _completions: {result._completions}", file=sys.stderr)
-                    # For simple cases, try to extract the first completion
-                    try:
-                        completion_values = list(result._completions.values())
-                        if completion_values and completion_values[0]:
-                            first_completion = completion_values[0][0]
-                            # For Q&A, assume first output field gets the completion
-                            if expected_outputs:
-                                outputs[expected_outputs[0]['name']] = str(first_completion)
-                    except Exception as e:
-                        print(f"DEBUG: Error extracting completions: {e}", file=sys.stderr)
-                
-                # Final fallback: extract from __dict__
-                if not outputs and hasattr(result, '__dict__'):
-                    result_dict = result.__dict__
-                    for k, v in result_dict.items():
-                        if not k.startswith('_') and k != 'completions':
-                            outputs[k] = str(v)
-            
-            # If we still have no real outputs, provide diagnostic info
-            if not outputs or all("[" in str(v) and "]" in str(v) for v in outputs.values()):
-                print("DEBUG: No outputs extracted, providing diagnostic info", file=sys.stderr)
-                for expected_field in [field['name'] for field in expected_outputs]:
-                    outputs[expected_field] = f"[DEBUG: Empty completions, LM may not be responding. Store: {result._store if hasattr(result, '_store') else 'N/A'}]"
+            outputs = self._extract_outputs(result, program_info)
             
             return {
                 "status": "ok",
@@ -591,24 +698,93 @@ class DSPyBridge:
             }
             
         except Exception as e:
-            import traceback
-            error_details = f"Program execution failed: {str(e)}\nTraceback: {traceback.format_exc()}"
-            return {"status": "error", "error": error_details}
+            return _err("Program execution failed", e)
+    
+    def _extract_outputs(self, result: Any, program_info: Dict[str, Any]) -> Dict[str, str]:
+        """Extract the expected output fields from a DSPy prediction.
+        
+        The accessor that produced every field is remembered in the program's
+        extraction plan, so later executions of the same signature try only
+        that accessor and fall back to the full scan if it misses.
+        """
+        output_list = program_info['_output_list']
+        field_mapping = program_info.get('field_mapping', {})
+        extract_plan = program_info.get('_extract_plan')
+        
+        # Fast path: only the accessor that worked for this signature before
+        if extract_plan and extract_plan["mode"] is not None:
+            extract = _EXTRACTORS[extract_plan["mode"]]
+            outputs = {}
+            for field_name in output_list:
+                value = extract(result, field_mapping.get(field_name, field_name))
+                if value is _MISSING:
+                    break
+                outputs[field_name] = str(value)
+            else:
+                return outputs
+        
+        outputs = {}
+        modes = set()
+        
+        # Single pass: try each accessor in order for every output field
+        for field_name in output_list:
+            dspy_field = field_mapping.get(field_name, field_name)
+            for mode, extract in enumerate(_EXTRACTORS):
+                value = extract(result, dspy_field)
+                if value is not _MISSING:
+                    outputs[field_name] = str(value)
+                    modes.add(mode)
+                    break
+            else:
+                outputs[field_name] = f"Field '{dspy_field}' not found in prediction."
+                modes.add(None)
+        
+        needs_fallback = not outputs or all("[" in str(v) and "]" in str(v) for v in outputs.values())
+        
+        # Remember the accessor when it alone produced every real output
+        if extract_plan is not None and not needs_fallback and len(modes) == 1 and None not in modes:
+            extract_plan["mode"] = modes.pop()
+        
+        # If still no outputs, try DSPy-specific extraction methods
+        if needs_fallback:
+            if DEBUG:
+                print("DEBUG: Using DSPy-specific extraction", file=sys.stderr)
+            
+            # Try accessing completions directly
+            if getattr(result, '_completions', None):
+                if DEBUG:
+                    print(f"DEBUG: Found _completions: {result._completions}", file=sys.stderr)
+                # For simple cases, try to extract the first completion
+                try:
+                    completion_values = list(result._completions.values())
+                    if completion_values and completion_values[0]:
+                        first_completion = completion_values[0][0]
+                        # For Q&A, assume first output field gets the completion
+                        if output_list:
+                            outputs[output_list[0]] = str(first_completion)
+                except Exception as e:
+                    if DEBUG:
+                        print(f"DEBUG: Error extracting completions: {e}", file=sys.stderr)
+            
+            # Final fallback: extract from __dict__
+            if not outputs and hasattr(result, '__dict__'):
+                result_dict = result.__dict__
+                for k, v in result_dict.items():
+                    if not k.startswith('_') and k != 'completions':
+                        outputs[k] = str(v)
+        
+        # If we still have no real outputs, provide diagnostic info
+        if not outputs or all("[" in str(v) and "]" in str(v) for v in outputs.values()):
+            if DEBUG:
+                print("DEBUG: No outputs extracted, providing diagnostic info", file=sys.stderr)
+            for expected_field in output_list:
+                outputs[expected_field] = f"[DEBUG: Empty completions, LM may not be responding. Store: {result._store if hasattr(result, '_store') else 'N/A'}]"
+        
+        return outputs
     
     def process_command(self, command: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """Process a command and return the result."""
-        handlers = {
-            "ping": self.handle_ping,
-            "configure_lm": self.handle_configure_lm,
-            "create_program": self.handle_create_program,
-            "execute_program": self.handle_execute_program,
-            "get_program": lambda args: self.program_manager.get_program(args.get("program_id")),
-            "list_programs": lambda args: self.program_manager.list_programs(),
-            "delete_program": lambda args: self.program_manager.delete_program(args.get("program_id")),
-            "clear_session": lambda args: self.program_manager.clear_session()
-        }
-        
-        handler = handlers.get(command)
+        handler = self._handlers.get(command)
         if handler:
             try:
                 return handler(args)
@@ -621,61 +797,208 @@ class DSPyBridge:
             return {
                 "status": "error",
                 "error": f"Unknown command: {command}",
-                "supported_commands": list(handlers.keys())
+                "supported_commands": list(self._handlers.keys())
             }
 
+# Commands that block on the LM and run on the handler's thread pool.
+# configure_lm stays inline: dspy.configure must run on the thread that
+# owns the DSPy settings.
+POOLED_COMMANDS = frozenset({"execute_program"})
+POOL_WORKERS = 8
+
+# Upper bound on buffers (header and payload per response) in one gathered write
+MAX_BATCH_BUFFERS = 128
+
 class ProtocolHandler:
     """Handles the wire protocol for communication with Snakepit."""
     
+    __slots__ = ("bridge", "codec", "_fd_in", "_fd_out", "_hdr", "_buf", "_pool", "_write_lock")
+    
     def __init__(self):
         self.bridge = DSPyBridge()
+        self.codec = "json"
+        # Raw descriptors; reads and writes bypass Python's buffered I/O
+        self._fd_in = sys.stdin.fileno()
+        self._fd_out = sys.stdout.fileno()
+        # Reusable receive buffers, grown on demand for larger payloads
+        self._hdr = bytearray(4)
+        self._buf = bytearray(65536)
+        # Long-running commands run here; the lock keeps response frames whole
+        self._pool = ThreadPoolExecutor(max_workers=POOL_WORKERS)
+        self._write_lock = threading.RLock()
+    
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        """Encode a message with the negotiated codec."""
+        if self.codec == "msgpack":
+            if MSGSPEC_AVAILABLE:
+                return _MSGPACK_ENCODER.encode(message)
+            return msgpack.packb(message, use_bin_type=True)
+        if ORJSON_AVAILABLE:
+            try:
+                return orjson.dumps(message)
+            except TypeError:
+                # orjson rejects ints wider than 64 bits and non-str keys,
+                # both of which the stdlib encoder accepts
+                pass
+        return json.dumps(message, separators=(',', ':')).encode('utf-8')
     
-    def read_message(self) -> Optional[Dict[str, Any]]:
+    def decode(self, data: Union[bytes, memoryview]) -> Request:
+        """Decode a request with the negotiated codec."""
+        if self.codec == "msgpack":
+            if MSGSPEC_AVAILABLE:
+                try:
+                    return _MSGPACK_DECODER.decode(data)
+                except msgspec.ValidationError:
+                    # Envelope does not match the typed Request (e.g. null args,
+                    # float id); decode untyped so process_command can answer
+                    # with an error response instead of the worker exiting
+                    return _request_from_dict(msgspec.msgpack.decode(data))
+            # strict_map_key=False accepts non-str keys, as msgspec does
+            return _request_from_dict(msgpack.unpackb(data, raw=False, strict_map_key=False))
+        if ORJSON_AVAILABLE:
+            return _request_from_dict(orjson.loads(data))
+        return _request_from_dict(json.loads(str(data, 'utf-8')))
+    
+    def _read_exact(self, view: memoryview) -> bool:
+        """Fill view from stdin, looping over short reads. False on EOF."""
+        have = 0
+        length = len(view)
+        while have < length:
+            count = os.readv(self._fd_in, [view[have:]])
+            if count == 0:
+                return False
+            have += count
+        return True
+    
+    def _write_all(self, chunks: List[bytes]) -> None:
+        """Write chunks to stdout with gathered writes until fully drained."""
+        views = [memoryview(chunk) for chunk in chunks]
+        while views:
+            written = os.writev(self._fd_out, views)
+            # Drop fully written chunks, then trim a partially written one
+            while views and written >= len(views[0]):
+                written -= len(views[0])
+                views.pop(0)
+            if written:
+                views[0] = views[0][written:]
+    
+    def read_message(self) -> Optional[Request]:
         """Read a message from stdin using the 4-byte length protocol."""
         try:
             # Read 4-byte length header
-            length_data = sys.stdin.buffer.read(4)
-            if len(length_data) != 4:
+            if not self._read_exact(memoryview(self._hdr)):
                 return None
             
             # Unpack length (big-endian)
-            length = struct.unpack('>I', length_data)[0]
+            length = int.from_bytes(self._hdr, 'big')
             
-            # Read JSON payload
-            json_data = sys.stdin.buffer.read(length)
-            if len(json_data) != length:
-                return None
+            # Grow the receive buffer if this payload does not fit
+            if length > len(self._buf):
+                self._buf.extend(bytes(length - len(self._buf)))
             
-            # Parse JSON
-            return json.loads(json_data.decode('utf-8'))
+            # Read payload into the buffer and decode it in place
+            with memoryview(self._buf) as view:
+                payload = view[:length]
+                try:
+                    if not self._read_exact(payload):
+                        return None
+                    return self.decode(payload)
+                finally:
+                    payload.release()
         except Exception as e:
             print(f"Error reading message: {e}", file=sys.stderr)
             return None
     
+    def frame_message(self, message: Dict[str, Any]) -> List[bytes]:
+        """Encode a message into its [length header, payload] frame."""
+        # Encode payload
+        payload = self.encode(message)
+        
+        # Length header (big-endian)
+        return [len(payload).to_bytes(4, 'big'), payload]
+    
+    def write_frames(self, frames: List[bytes]) -> bool:
+        """Write already-encoded frames to stdout in one gathered write."""
+        try:
+            with self._write_lock:
+                self._write_all(frames)
+            return True
+        except Exception as e:
+            print(f"Error writing message: {e}", file=sys.stderr)
+            return False
+    
     def write_message(self, message: Dict[str, Any]) -> bool:
         """Write a message to stdout using the 4-byte length protocol."""
         try:
-            # Encode JSON
-            json_data = json.dumps(message, separators=(',', ':')).encode('utf-8')
-            
-            # Write length header (big-endian)
-            length = struct.pack('>I', len(json_data))
-            sys.stdout.buffer.write(length)
-            
-            # Write JSON payload
-            sys.stdout.buffer.write(json_data)
-            sys.stdout.buffer.flush()
-            
-            return True
+            frames = self.frame_message(message)
         except Exception as e:
             print(f"Error writing message: {e}", file=sys.stderr)
             return False
+        return self.write_frames(frames)
+    
+    def _input_ready(self) -> bool:
+        """Check, without blocking, whether another request is already waiting."""
+        readable, _, _ = select.select([self._fd_in], [], [], 0)
+        return bool(readable)
+    
+    def _respond(self, request_id: Any, command: str, args: Dict[str, Any], now: float) -> Dict[str, Any]:
+        """Process one command and wrap its result in a response envelope."""
+        try:
+            # Process command
+            result = self.bridge.process_command(command, args)
+            
+            # Send success response
+            return {
+                "id": request_id,
+                "success": True,
+                "result": result,
+                "timestamp": now
+            }
+        except Exception as e:
+            # Send error response
+            return {
+                "id": request_id,
+                "success": False,
+                "error": str(e),
+                "timestamp": now
+            }
+    
+    def _frame_response(self, response: Dict[str, Any]) -> List[bytes]:
+        """Frame a response, answering with an error envelope if it cannot be encoded."""
+        try:
+            return self.frame_message(response)
+        except Exception as e:
+            print(f"Error writing message: {e}", file=sys.stderr)
+            return self.frame_message({
+                "id": response["id"],
+                "success": False,
+                "error": f"Failed to encode response: {e}",
+                "timestamp": response["timestamp"]
+            })
+    
+    def _write_completed(self, future: Future) -> None:
+        """Write the response of a command that finished on the thread pool."""
+        try:
+            response = future.result()
+            # Encode under the lock so a concurrent codec switch cannot reorder frames
+            with self._write_lock:
+                self.write_frames(self._frame_response(response))
+        except Exception as e:
+            print(f"Error in background command: {e}", file=sys.stderr)
     
     def run(self):
-        """Main message loop."""
+        """Main message loop.
+        
+        Requests that are already pipelined on stdin are processed back to
+        back and their responses flushed together in a single write.
+        Long-running commands run on a thread pool and write their response
+        when done, so they do not hold up the loop; responses may therefore
+        arrive out of order and are correlated by ``id``.
+        """
         print("DSPy Bridge started in pool-worker mode", file=sys.stderr)
         print(f"DSPy available: {DSPY_AVAILABLE}", file=sys.stderr)
         
+        pending = []
         while True:
             # Read request
             request = self.read_message()
@@ -683,33 +1006,49 @@ class ProtocolHandler:
                 break
             
             # Extract request details
-            request_id = request.get("id")
-            command = request.get("command")
-            args = request.get("args", {})
+            request_id = request.id
+            command = request.command
+            args = request.args
             
-            try:
-                # Process command
-                result = self.bridge.process_command(command, args)
+            # One wall-clock read per request, shared by the handlers
+            now = time.time()
+            self.bridge._now = now
+            
+            if command in POOLED_COMMANDS:
+                # Hand off to the pool; the response is written on completion
+                future = self._pool.submit(self._respond, request_id, command, args, now)
+                future.add_done_callback(self._write_completed)
+            else:
+                response = self._respond(request_id, command, args, now)
                 
-                # Send success response
-                response = {
-                    "id": request_id,
-                    "success": True,
-                    "result": result,
-                    "timestamp": time.time()
-                }
-            except Exception as e:
-                # Send error response
-                response = {
-                    "id": request_id,
-                    "success": False,
-                    "error": str(e),
-                    "timestamp": time.time()
-                }
+                # Encode response
+                try:
+                    pending.extend(self._frame_response(response))
+                except Exception as e:
+                    print(f"Error writing message: {e}", file=sys.stderr)
+                    break
+                
+                # Switch codec only after the ping response went out in the old one
+                if command == "ping" and response["success"] and "codec" in response["result"]:
+                    with self._write_lock:
+                        frames, pending = pending, []
+                        if not self.write_frames(frames):
+                            break
+                        self.codec = response["result"]["codec"]
             
-            # Write response
-            if not self.write_message(response):
+            # Keep draining while more requests are waiting, then flush the batch
+            if len(pending) < MAX_BATCH_BUFFERS and self._input_ready():
+                continue
+            frames, pending = pending, []
+            if frames and not self.write_frames(frames):
                 break
+        
+        # Flush responses batched before EOF or an encoding failure
+        if pending:
+            self.write_frames(pending)
+        
+        # Let in-flight commands finish and write their responses
+        self._pool.shutdown(wait=True)
 
 def main():
     """Main entry point."""